@@ -1,140 +1,973 @@
-import argparse
+from __future__ import annotations
+
+import collections
+import ctypes
+import errno
+import functools
+import itertools
 import os
+import sys
 import stat
 import time
 import logging
+import types
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Union
-import pathspec
-from rich.console import Console
-from rich.table import Table
+from typing import TYPE_CHECKING, Collection, Deque, Iterable, Iterator, List, Dict, Optional, Tuple, Union
 
+# pathspec, hyperscan, rich and multiprocessing are imported where they are
+# first needed, so that runs without --exclude do not pay for loading them
+# before the walk.
+if TYPE_CHECKING:
+    import pathspec
+    from rich.table import Table
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def setup_argparse() -> argparse.ArgumentParser:
+# statx(2) constants, see <linux/stat.h> and <linux/fcntl.h>
+AT_FDCWD = -100
+AT_STATX_DONT_SYNC = 0x4000
+STATX_TYPE = 0x0001
+STATX_MODE = 0x0002
+STATX_ATIME = 0x0020
+STATX_MTIME = 0x0040
+STATX_TIMES = STATX_ATIME | STATX_MTIME
+STATX_WANTED = STATX_TYPE | STATX_MODE | STATX_TIMES
+
+# Number of walked paths handed to the stat stage at a time
+STAT_BATCH_SIZE = 512
+
+# Stat calls are I/O-bound and release the GIL, so oversubscribe the CPUs
+DEFAULT_JOBS = (os.cpu_count() or 1) * 4
+
+# Worker processes for large trees with exclusion patterns, and the entry count
+# below which a tree is walked in a single process
+DEFAULT_PROCESSES = 1
+SHARD_MIN_ENTRIES = 1000
+
+# Report entries formatted before each write, and the report file buffer size
+REPORT_CHUNK_SIZE = 65536
+REPORT_BUFFER_SIZE = 1 << 20
+
+# Only the most recent results are kept for the on-screen table
+TABLE_ROW_LIMIT = 1000
+
+# Distinct seconds whose time.ctime() output is kept for reuse
+CTIME_CACHE_SIZE = 65536
+
+
+class statx_timestamp(ctypes.Structure):
+    _fields_ = [
+        ("tv_sec", ctypes.c_int64),
+        ("tv_nsec", ctypes.c_uint32),
+        ("__reserved", ctypes.c_int32),
+    ]
+
+
+class statx_t(ctypes.Structure):
+    """
+    Mirrors the kernel's 256-byte ``struct statx``.
+    """
+    _fields_ = [
+        ("stx_mask", ctypes.c_uint32),
+        ("stx_blksize", ctypes.c_uint32),
+        ("stx_attributes", ctypes.c_uint64),
+        ("stx_nlink", ctypes.c_uint32),
+        ("stx_uid", ctypes.c_uint32),
+        ("stx_gid", ctypes.c_uint32),
+        ("stx_mode", ctypes.c_uint16),
+        ("__spare0", ctypes.c_uint16),
+        ("stx_ino", ctypes.c_uint64),
+        ("stx_size", ctypes.c_uint64),
+        ("stx_blocks", ctypes.c_uint64),
+        ("stx_attributes_mask", ctypes.c_uint64),
+        ("stx_atime", statx_timestamp),
+        ("stx_btime", statx_timestamp),
+        ("stx_ctime", statx_timestamp),
+        ("stx_mtime", statx_timestamp),
+        ("stx_rdev_major", ctypes.c_uint32),
+        ("stx_rdev_minor", ctypes.c_uint32),
+        ("stx_dev_major", ctypes.c_uint32),
+        ("stx_dev_minor", ctypes.c_uint32),
+        ("__spare2", ctypes.c_uint64 * 14),
+    ]
+
+
+try:
+    # CPython's C implementation is faster than any Python-level table lookup.
+    from _stat import filemode as fast_filemode
+except ImportError:
+    # Without it stat.filemode walks a table of bit tests per call, so build
+    # every permission string up front: one table for the 12 permission bits
+    # and one for the file type nibble.
+    _PERM_TABLE = [stat.filemode(mode)[1:] for mode in range(0o10000)]
+    _TYPE_TABLE = [stat.filemode(file_type << 12)[0] for file_type in range(16)]
+
+    def fast_filemode(mode: int) -> str:
+        """
+        Converts a file's mode to a string of the form '-rwxrwxrwx', like stat.filemode.
+
+        Args:
+            mode (int): The st_mode of the file.
+
+        Returns:
+            str: The permission string.
+        """
+        return _TYPE_TABLE[(mode >> 12) & 0xF] + _PERM_TABLE[mode & 0o7777]
+
+
+# Set once statx turns out to be unsupported so we stop probing it.
+_statx_unsupported = False
+
+
+@functools.lru_cache(maxsize=None)
+def _load_statx():
+    """
+    Looks up glibc's statx wrapper (glibc >= 2.28, kernel >= 4.11).
+
+    Returns:
+        The ctypes statx function, or None if it is not available.
+    """
+    try:
+        libc = ctypes.CDLL("libc.so.6", use_errno=True)
+        func = libc.statx
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_uint, ctypes.POINTER(statx_t)]
+    func.restype = ctypes.c_int
+    return func
+
+
+def stat_times(file_path: str, buf: statx_t = None) -> Tuple[int, int, int]:
+    """
+    Fetches the access time and modification time, in nanoseconds since the
+    epoch, and the mode of a file.
+
+    Uses statx(2) with AT_STATX_DONT_SYNC and only the fields we need, falling
+    back to os.stat on systems without statx, where statx is blocked, and for
+    files whose filesystem does not report both times through statx.
+
+    Args:
+        file_path (str): The path to the file.
+        buf (statx_t, optional): A buffer to reuse for the statx result. Defaults to None.
+
+    Returns:
+        Tuple[int, int, int]: The access time, modification time and st_mode.
+
+    Raises:
+        OSError: If the file cannot be stat'ed.
+    """
+    global _statx_unsupported
+
+    statx = None if _statx_unsupported else _load_statx()
+    if statx is not None:
+        if buf is None:
+            buf = statx_t()
+        if statx(AT_FDCWD, os.fsencode(file_path), AT_STATX_DONT_SYNC, STATX_WANTED, ctypes.byref(buf)) == 0:
+            # Filesystems may leave out fields they do not keep; unfilled
+            # times read as zero, so let os.stat report them instead.
+            if buf.stx_mask & STATX_TIMES == STATX_TIMES:
+                return (
+                    buf.stx_atime.tv_sec * 1_000_000_000 + buf.stx_atime.tv_nsec,
+                    buf.stx_mtime.tv_sec * 1_000_000_000 + buf.stx_mtime.tv_nsec,
+                    buf.stx_mode,
+                )
+        else:
+            err = ctypes.get_errno()
+            # Seccomp filters in containers commonly reject statx with EPERM.
+            if err not in (errno.ENOSYS, errno.EINVAL, errno.EPERM):
+                raise OSError(err, os.strerror(err), file_path)
+            _statx_unsupported = True
+
+    stat_info = os.stat(file_path)
+    return stat_info.st_atime_ns, stat_info.st_mtime_ns, stat_info.st_mode
+
+DESCRIPTION = "Analyzes permission usage patterns over time to identify dormant or underutilized permissions."
+
+# Command-line options: name -> (metavar, type, default, help), in --help order.
+# Options without a metavar are flags that take no value.
+OPTIONS = {
+    "--days": ("DAYS", int, 365,
+               "Number of days to consider when determining 'dormant' permissions. Default: 365."),
+    "--output": ("OUTPUT", str, "report.txt",
+                 "File to write the report to. Default: report.txt"),
+    "--exclude": ("EXCLUDE", str, None,
+                  "Path to a .gitignore-style file containing patterns to exclude from analysis."),
+    "--jobs": ("JOBS", int, DEFAULT_JOBS,
+               f"Number of threads used to stat files. Default: {DEFAULT_JOBS}."),
+    "--processes": ("PROCESSES", int, DEFAULT_PROCESSES,
+                    f"Number of processes sharing the top-level directories of large trees when --exclude is given. Default: {DEFAULT_PROCESSES}."),
+    "--summary": (None, bool, False,
+                  "Show only the number of files and dormant files instead of the results table."),
+}
+
+
+def format_usage(prog: str) -> str:
+    """
+    Builds the one-line usage message.
+
+    Args:
+        prog (str): The program name.
+
+    Returns:
+        str: The usage message.
+    """
+    options = " ".join(f"[{name} {metavar}]" if metavar else f"[{name}]" for name, (metavar, _, _, _) in OPTIONS.items())
+    return f"usage: {prog} [-h] {options} path"
+
+
+def format_help(prog: str) -> str:
+    """
+    Builds the --help message.
+
+    Args:
+        prog (str): The program name.
+
+    Returns:
+        str: The help message.
+    """
+    lines = [format_usage(prog), "", DESCRIPTION, "", "positional arguments:",
+             "  path                  The path to analyze.  Can be a file or directory.", "",
+             "options:", "  -h, --help            show this help message and exit"]
+    for name, (metavar, _, _, help_text) in OPTIONS.items():
+        invocation = f"  {name} {metavar or ''}".rstrip()
+        # Like argparse, put the help of long invocations on its own line.
+        if len(invocation) > 22:
+            lines.append(invocation)
+            invocation = ""
+        lines.append(invocation.ljust(24) + help_text)
+    return "\n".join(lines)
+
+
+def parse_args(argv: List[str] = None) -> types.SimpleNamespace:
+    """
+    Parses the command-line arguments.
+
+    A small hand-rolled parser: importing argparse and building a parser is a
+    noticeable part of start-up time when the tool is run once per directory
+    from a shell loop. Accepts "--name value" and "--name=value", and exits
+    with status 2 on usage errors like argparse does.
+
+    Args:
+        argv (List[str], optional): The arguments, without the program name. Defaults to sys.argv[1:].
+
+    Returns:
+        types.SimpleNamespace: The parsed arguments, with one attribute per option and "path".
+    """
+    prog = os.path.basename(sys.argv[0])
+    args = iter(sys.argv[1:] if argv is None else argv)
+    values = {name[2:]: default for name, (_, _, default, _) in OPTIONS.items()}
+    positional = []
+
+    def fail(message: str):
+        print(format_usage(prog), file=sys.stderr)
+        print(f"{prog}: error: {message}", file=sys.stderr)
+        sys.exit(2)
+
+    for arg in args:
+        if arg in ("-h", "--help"):
+            print(format_help(prog))
+            sys.exit(0)
+        if arg == "--":
+            positional.extend(args)
+            break
+        if not arg.startswith("-") or arg == "-":
+            positional.append(arg)
+            continue
+
+        name, has_value, value = arg.partition("=")
+        if name not in OPTIONS:
+            fail(f"unrecognized arguments: {arg}")
+        metavar, convert, _, _ = OPTIONS[name]
+        if metavar is None:
+            if has_value:
+                fail(f"argument {name}: ignored explicit argument '{value}'")
+            values[name[2:]] = True
+            continue
+        if not has_value:
+            value = next(args, None)
+            if value is None:
+                fail(f"argument {name}: expected one argument")
+        try:
+            values[name[2:]] = convert(value)
+        except ValueError:
+            fail(f"argument {name}: invalid {convert.__name__} value: '{value}'")
+
+    if not positional:
+        fail("the following arguments are required: path")
+    if len(positional) > 1:
+        fail(f"unrecognized arguments: {' '.join(positional[1:])}")
+    return types.SimpleNamespace(path=positional[0], **values)
+
+
+@functools.lru_cache(maxsize=None)
+def load_hyperscan():
     """
-    Sets up the argument parser for the command-line interface.
+    Imports the optional hyperscan module.
 
     Returns:
-        argparse.ArgumentParser: The configured argument parser.
+        The hyperscan module, or None if it is not installed.
     """
-    parser = argparse.ArgumentParser(
-        description="Analyzes permission usage patterns over time to identify dormant or underutilized permissions."
-    )
+    try:
+        import hyperscan
+    except ImportError:  # Optional: exclusion patterns fall back to pathspec's own matching.
+        return None
+    return hyperscan
+
+
+@functools.lru_cache(maxsize=None)
+def hyperscan_usable() -> bool:
+    """
+    Checks that Hyperscan is installed and matches correctly on this machine.
+
+    Some Hyperscan builds miss matches of a character class after a "(?:.+/)?"
+    group once the input is longer than 17 bytes, a shape every gitwildmatch
+    pattern starting with a wildcard compiles to. Such builds are not used.
+
+    Returns:
+        bool: True if exclusion patterns may be matched with Hyperscan.
+    """
+    hyperscan = load_hyperscan()
+    if hyperscan is None:
+        return False
+    hits = []
+    database = hyperscan.Database()
+    database.compile(expressions=[rb"^(?:.+/)?[ab](?:/|$)"], ids=[0], elements=1, flags=hyperscan.HS_FLAG_SINGLEMATCH)
+    database.scan(b"q" * 18 + b"/a", match_event_handler=lambda *args: hits.append(args[0]), context=None)
+    if not hits:
+        logging.warning("The installed Hyperscan misses pattern matches on this machine, not using it.")
+    return bool(hits)
+
+
+def compile_spec(lines: Iterable[str]) -> pathspec.PathSpec:
+    """
+    Compiles gitwildmatch pattern lines, keeping pathspec off a faulty Hyperscan.
+
+    Args:
+        lines (Iterable[str]): The pattern lines.
+
+    Returns:
+        pathspec.PathSpec: The compiled patterns.
+    """
+    import pathspec
+
+    if load_hyperscan() is not None and not hyperscan_usable():
+        try:
+            return pathspec.PathSpec.from_lines("gitwildmatch", lines, backend="simple")
+        except TypeError:  # pathspec < 1.0 has no backends and never uses Hyperscan.
+            pass
+    return pathspec.PathSpec.from_lines("gitwildmatch", lines)
+
+
+class HyperscanSpec:
+    """
+    Matches paths against a compiled pathspec.PathSpec with a single Hyperscan
+    database, so every pattern is tested in one pass over the path.
+
+    Scanning reuses one scratch area, so an instance must not be shared between
+    threads.
+    """
+
+    def __init__(self, patterns: List[pathspec.Pattern], database):
+        from pathspec.util import normalize_file
+
+        self.normalize_file = normalize_file
+        self.patterns = patterns
+        self.database = database
+        self.includes = [pattern.include for pattern in patterns]
+
+    @classmethod
+    def from_spec(cls, spec: pathspec.PathSpec) -> Optional["HyperscanSpec"]:
+        """
+        Compiles the patterns of a PathSpec into a Hyperscan database.
+
+        Args:
+            spec (pathspec.PathSpec): The compiled gitwildmatch patterns.
+
+        Returns:
+            Optional[HyperscanSpec]: The matcher, or None if Hyperscan is not installed
+                                     or cannot compile the patterns.
+        """
+        if not hyperscan_usable():
+            return None
+        hyperscan = load_hyperscan()
+        patterns = [pattern for pattern in spec.patterns if pattern.include is not None]
+        if not patterns:
+            return None
+        # Ids follow pattern order so the highest matching id is the last match,
+        # which decides the outcome under gitignore semantics.
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[pattern.regex.pattern.encode("utf-8") for pattern in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_ALLOWEMPTY | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP,
+            )
+        except hyperscan.error as e:
+            logging.warning(f"Falling back to pathspec matching, Hyperscan could not compile the patterns: {e}")
+            return None
+        return cls(patterns, database)
+
+    @staticmethod
+    def _on_match(id: int, start: int, end: int, flags: int, hits: List[int]) -> None:
+        hits.append(id)
+
+    def match_file(self, path: str) -> bool:
+        """
+        Checks a path against the compiled patterns.
+
+        Args:
+            path (str): The path to check.
+
+        Returns:
+            bool: True if the last matching pattern excludes the path.
+        """
+        norm = self.normalize_file(path)
+        try:
+            data = norm.encode("utf-8")
+        except UnicodeEncodeError:
+            # Names that are not valid UTF-8 cannot be scanned in UTF-8 mode,
+            # so test them with the patterns' own regexes, last match first.
+            for pattern in reversed(self.patterns):
+                if pattern.regex.match(norm):
+                    return pattern.include
+            return False
+        hits = []
+        self.database.scan(data, match_event_handler=self._on_match, context=hits)
+        return bool(hits) and self.includes[max(hits)]
+
+
+class ExcludeSpec:
+    """
+    Matches paths against .gitignore-style exclusion patterns.
+
+    When no pattern negates another, the common simple forms are answered
+    without regular expressions: literal names and paths are hash lookups,
+    pure prefixes ("src/**") are looked up at each slash of the path, and
+    suffixes ("*.log") are a single str.endswith. Only the remaining patterns
+    go through pathspec, or Hyperscan when it is installed. Files found by a
+    walk that already pruned their parents are only matched against the
+    patterns that can apply to a file's own name.
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        """
+        Compiles the given pattern lines.
+
+        Args:
+            lines (Iterable[str]): The lines of a .gitignore-style file.
+        """
+        from pathspec.util import normalize_file
+
+        self.normalize_file = normalize_file
+        self.lines = [line.rstrip("\n") for line in lines]
+        self.spec = compile_spec(self.lines)
+        negated = any(pattern.include is False for pattern in self.spec.patterns)
+
+        # Simple patterns, split by how gitwildmatch anchors them: bare names
+        # and suffixes match any path component, patterns with an inner slash
+        # match from the root. Directory-only patterns (trailing slash) are
+        # kept apart.
+        self.literal_names = set()
+        self.literal_dir_names = set()
+        self.literal_paths = set()
+        self.literal_dir_paths = set()
+        self.prefixes = set()
+        suffixes = set()
+        if negated:
+            # Later patterns may re-include earlier matches, so order matters
+            # and everything has to go through the full matcher.
+            remaining = self.lines
+        else:
+            remaining = [line for line in self.lines if not self._add_simple(line, suffixes)]
+        self.literal_names = frozenset(self.literal_names)
+        self.literal_dir_names = frozenset(self.literal_dir_names)
+        self.literal_paths = frozenset(self.literal_paths)
+        self.literal_dir_paths = frozenset(self.literal_dir_paths)
+        self.prefixes = frozenset(self.prefixes)
+        self.suffixes = tuple(sorted(suffixes))
+        self.has_simple = len(remaining) < len(self.lines)
+
+        # Directory-only patterns reach a file only through one of its parent
+        # directories, so they can be left out for files whose parents were
+        # checked. Directories are always matched against all of them.
+        dir_spec = self.spec if negated else compile_spec(remaining)
+        if negated:
+            file_spec = self.spec
+        else:
+            file_spec = compile_spec([line for line in remaining if not line.rstrip().endswith("/")])
+        self.spec_matcher = self._make_matcher(dir_spec)
+        self.file_spec_matcher = self.spec_matcher if file_spec is dir_spec else self._make_matcher(file_spec)
+
+    def _add_simple(self, line: str, suffixes: set) -> bool:
+        """
+        Files a pattern line under one of the simple forms, if it is one.
+
+        Args:
+            line (str): The pattern line.
+            suffixes (set): The suffix patterns collected so far.
+
+        Returns:
+            bool: True if the line needs no regex matching.
+        """
+        if not line or line.startswith("#"):
+            return True
+        if line != line.strip() or line.startswith("!") or "\\" in line:
+            return False
+
+        # "**/name" is the same as "name", and "**/name/**" as "name/".
+        unanchored = line.startswith("**/")
+        core = line[3:] if unanchored else line
+        if core.endswith("/**"):
+            body = core[:-3].lstrip("/")
+            if not body or any(c in body for c in "*?["):
+                return False
+            if not unanchored:
+                self.prefixes.add(body)
+            elif "/" in body:
+                return False
+            else:
+                self.literal_dir_names.add(body)
+            return True
+
+        if core.startswith("*") and not any(c in core[1:] for c in "*?[/"):
+            if len(core) == 1:
+                return False
+            suffixes.add(core[1:])
+            return True
+
+        if any(c in core for c in "*?["):
+            return False
+        dir_only = core.endswith("/")
+        body = core.strip("/")
+        if not body:
+            return False
+        if "/" in core.rstrip("/"):
+            if unanchored:
+                return False
+            (self.literal_dir_paths if dir_only else self.literal_paths).add(body)
+        else:
+            (self.literal_dir_names if dir_only else self.literal_names).add(body)
+        return True
+
+    @staticmethod
+    def _make_matcher(spec: pathspec.PathSpec):
+        if not any(pattern.include is not None for pattern in spec.patterns):
+            return None
+        return HyperscanSpec.from_spec(spec) or spec
+
+    def _match_simple(self, norm: str, parent_checked: bool) -> bool:
+        """
+        Checks a normalized path against the simple patterns only.
+
+        Args:
+            norm (str): The normalized path to check. Directories end with a slash.
+            parent_checked (bool): Whether the directory containing the path is known not to be
+                                   excluded, so only its last component needs checking.
+
+        Returns:
+            bool: True if a simple pattern matches the path.
+        """
+        is_dir = norm.endswith("/")
+        norm = norm.rstrip("/")
+        parent, _, name = norm.rpartition("/")
+        if name in self.literal_names or norm in self.literal_paths or name.endswith(self.suffixes):
+            return True
+        if is_dir and (name in self.literal_dir_names or norm in self.literal_dir_paths or norm in self.prefixes):
+            return True
+        if parent_checked or not parent:
+            return False
+
+        # Every component before the last is a directory.
+        start = 0
+        while True:
+            end = norm.find("/", start)
+            if end < 0 or end > len(parent):
+                return False
+            ancestor = norm[:end]
+            component = norm[start:end]
+            if (
+                component in self.literal_names or component in self.literal_dir_names
+                or component.endswith(self.suffixes)
+                or ancestor in self.literal_paths or ancestor in self.literal_dir_paths
+                or ancestor in self.prefixes
+            ):
+                return True
+            start = end + 1
+
+    def match_file(self, path: str, parent_checked: bool = False) -> bool:
+        """
+        Checks a path against all patterns.
+
+        Args:
+            path (str): The path to check. Directories end with a slash.
+            parent_checked (bool, optional): Whether the directory containing the path is known
+                                             not to be excluded. Defaults to False.
 
-    parser.add_argument(
-        "path",
-        type=str,
-        help="The path to analyze.  Can be a file or directory."
-    )
+        Returns:
+            bool: True if the path is excluded.
+        """
+        if self.has_simple:
+            norm = self.normalize_file(path)
+            if norm.startswith("/") or "//" in norm:
+                # gitwildmatch treats empty path components specially, which
+                # the simple forms do not model.
+                return bool(self.spec.match_file(path))
+            if self._match_simple(norm, parent_checked):
+                return True
+        if parent_checked and not path.endswith("/"):
+            matcher = self.file_spec_matcher
+        else:
+            matcher = self.spec_matcher
+        return matcher is not None and bool(matcher.match_file(path))
 
-    parser.add_argument(
-        "--days",
-        type=int,
-        default=365,
-        help="Number of days to consider when determining 'dormant' permissions. Default: 365."
-    )
+    def match_dir(self, path: str) -> bool:
+        """
+        Checks a directory reached by a walk against all patterns.
 
-    parser.add_argument(
-        "--output",
-        type=str,
-        default="report.txt",
-        help="File to write the report to. Default: report.txt"
-    )
-    parser.add_argument(
-        "--exclude",
-        type=str,
-        default=None,
-        help="Path to a .gitignore-style file containing patterns to exclude from analysis."
-    )
-    return parser
+        Args:
+            path (str): The directory to check. Its parents must already have been checked.
 
+        Returns:
+            bool: True if the directory is excluded.
+        """
+        return self.match_file(path.rstrip("/") + "/", parent_checked=True)
 
-def is_excluded(path: str, exclude_patterns: pathspec.PathSpec = None) -> bool:
+    def __reduce__(self):
+        # The compiled matchers cannot be pickled, so worker processes
+        # recompile from the pattern lines.
+        return (ExcludeSpec, (self.lines,))
+
+
+def is_excluded(path: str, exclude_patterns: ExcludeSpec = None, parent_checked: bool = False) -> bool:
     """
     Checks if a given path should be excluded based on provided patterns.
 
     Args:
         path (str): The path to check.
-        exclude_patterns (pathspec.PathSpec, optional): A PathSpec object containing exclusion patterns. Defaults to None.
+        exclude_patterns (ExcludeSpec, optional): An ExcludeSpec object containing exclusion patterns. Defaults to None.
+        parent_checked (bool, optional): Whether the directory containing the path is known
+                                         not to be excluded. Defaults to False.
 
     Returns:
         bool: True if the path should be excluded, False otherwise.
     """
     if exclude_patterns is None:
         return False
-    return exclude_patterns.match_file(path)
+    return exclude_patterns.match_file(path, parent_checked)
+
+
+def is_excluded_dir(path: str, exclude_patterns: ExcludeSpec = None) -> bool:
+    """
+    Checks if a directory reached by a walk should be excluded.
+
+    The directory's parents must already have been checked.
+
+    Args:
+        path (str): The directory to check.
+        exclude_patterns (ExcludeSpec, optional): An ExcludeSpec object containing exclusion patterns. Defaults to None.
+
+    Returns:
+        bool: True if the directory should be excluded, False otherwise.
+    """
+    if exclude_patterns is None:
+        return False
+    return exclude_patterns.match_dir(path)
 
-def analyze_permissions(path: str, days: int, exclude_patterns: pathspec.PathSpec = None) -> List[Dict[str, Union[str, int, bool]]]:
+def iter_files(path: str, exclude_patterns: ExcludeSpec = None) -> Iterator[str]:
+    """
+    Yields the paths of all non-excluded files within the given directory.
+
+    Args:
+        path (str): The directory to walk.
+        exclude_patterns (ExcludeSpec, optional): An ExcludeSpec object containing exclusion patterns. Defaults to None.
+
+    Yields:
+        str: The path of each file to analyze.
+    """
+    # Files below the walk root are matched assuming their parents were
+    # checked, so check the root itself first.
+    if is_excluded(os.path.join(path, ""), exclude_patterns):
+        return
+
+    # Walk top-down with an explicit stack, visiting entries in the same order
+    # os.walk would, but reusing the DirEntry type information from scandir
+    # instead of discarding it.
+    pending = [path]
+    while pending:
+        subdirs = []
+        yield from list_dir(pending.pop(), exclude_patterns, subdirs)
+        pending.extend(reversed(subdirs))
+
+
+def list_dir(root: str, exclude_patterns: ExcludeSpec, subdirs: List[str]) -> Iterator[str]:
+    """
+    Yields the non-excluded files directly within a directory and collects its
+    non-excluded subdirectories.
+
+    Errors reading the directory are logged, not raised.
+
+    Args:
+        root (str): The directory to list. Its parents must already have been checked.
+        exclude_patterns (ExcludeSpec): An ExcludeSpec object containing exclusion patterns, or None.
+        subdirs (List[str]): A list receiving the subdirectories to descend into.
+
+    Yields:
+        str: The path of each file to analyze.
+    """
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    # Prune excluded directories before descending into them.
+                    if not is_excluded_dir(entry.path, exclude_patterns):
+                        subdirs.append(entry.path)
+                elif entry.is_dir():
+                    # Symlinks to directories are neither followed nor reported.
+                    continue
+                elif not is_excluded(entry.path, exclude_patterns, parent_checked=True):
+                    yield entry.path
+    except OSError as e:
+        logging.error(f"Error reading directory {root}: {e}")
+
+
+def has_entries(path: str, count: int) -> bool:
+    """
+    Checks whether a directory tree has at least the given number of entries,
+    stopping as soon as it does.
+
+    Args:
+        path (str): The directory to check.
+        count (int): The number of entries to look for.
+
+    Returns:
+        bool: True if the tree has at least count entries.
+    """
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    count -= 1
+                    if count <= 0:
+                        return True
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+        except OSError:
+            continue
+    return False
+
+
+# Per-process state of the shard workers, set up by _init_shard_worker
+_shard_state = {}
+
+
+def _init_shard_worker(exclude_patterns: ExcludeSpec, cutoff_ns: int, jobs: int) -> None:
+    _shard_state.update(exclude_patterns=exclude_patterns, cutoff_ns=cutoff_ns, jobs=jobs)
+
+
+def _analyze_shard(path: str) -> List[Dict[str, Union[str, int, bool]]]:
+    return list(analyze_paths(
+        iter_files(path, _shard_state["exclude_patterns"]), _shard_state["cutoff_ns"], _shard_state["jobs"]
+    ))
+
+
+def analyze_sharded(path: str, cutoff_ns: int, exclude_patterns: ExcludeSpec = None, jobs: int = 1, processes: int = 1) -> Iterator[Dict[str, Union[str, int, bool]]]:
+    """
+    Analyzes a directory tree with one task per top-level subdirectory, spread
+    over a pool of worker processes.
+
+    Exclusion matching is CPU-bound Python code, so separate processes scale
+    where threads are held back by the GIL. Each worker compiles the exclusion
+    patterns once and runs the normal walk on its subdirectories. Results come
+    back whole per subdirectory, in the order a single-process walk yields them.
+    Only as many subdirectories as there are workers are handed out ahead of
+    the one being yielded, so at most processes + 1 subdirectories' results
+    are held at a time.
+
+    Args:
+        path (str): The directory to analyze. It must already have been checked against the exclusion patterns.
+        cutoff_ns (int): The time, in nanoseconds since the epoch, before which unused files are dormant.
+        exclude_patterns (ExcludeSpec, optional): An ExcludeSpec object containing exclusion patterns. Defaults to None.
+        jobs (int, optional): The total number of threads used to stat files, shared by the workers. Defaults to 1.
+        processes (int, optional): The number of worker processes. Defaults to 1.
+
+    Yields:
+        Dict[str, Union[str, int, bool]]: A dictionary for each file, representing its permission analysis results.
+    """
+    subdirs = []
+    root_files = list(list_dir(path, exclude_patterns, subdirs))
+    processes = min(processes, len(subdirs))
+    if processes <= 1:
+        yield from analyze_paths(itertools.chain(root_files, iter_subdirs(subdirs, exclude_patterns)), cutoff_ns, jobs)
+        return
+
+    import multiprocessing
+
+    initargs = (exclude_patterns, cutoff_ns, max(1, jobs // processes))
+    with multiprocessing.Pool(processes, initializer=_init_shard_worker, initargs=initargs) as pool:
+        remaining = iter(subdirs)
+        shards = collections.deque(
+            pool.apply_async(_analyze_shard, (subdir,)) for subdir in itertools.islice(remaining, processes)
+        )
+        yield from analyze_paths(root_files, cutoff_ns, jobs)
+        while shards:
+            results = shards.popleft().get()
+            # Keep every worker busy while this shard is consumed.
+            for subdir in itertools.islice(remaining, 1):
+                shards.append(pool.apply_async(_analyze_shard, (subdir,)))
+            yield from results
+
+
+def iter_subdirs(subdirs: Iterable[str], exclude_patterns: ExcludeSpec = None) -> Iterator[str]:
+    """
+    Yields the files of several already checked directory trees in turn.
+
+    Args:
+        subdirs (Iterable[str]): The directories to walk.
+        exclude_patterns (ExcludeSpec, optional): An ExcludeSpec object containing exclusion patterns. Defaults to None.
+
+    Yields:
+        str: The path of each file to analyze.
+    """
+    for subdir in subdirs:
+        yield from iter_files(subdir, exclude_patterns)
+
+
+def analyze_paths(paths: Iterable[str], cutoff_ns: int, jobs: int = 1) -> Iterator[Dict[str, Union[str, int, bool]]]:
+    """
+    Analyzes files in windows of STAT_BATCH_SIZE paths.
+
+    The walk is consumed a window at a time so directory reads and stat calls
+    are issued in bursts instead of being interleaved file by file. With more
+    than one job, each window is split into one slice per thread and the
+    slices are analyzed on a thread pool so that stat latency on remote
+    filesystems overlaps.
+
+    Args:
+        paths (Iterable[str]): The file paths to analyze.
+        cutoff_ns (int): The time, in nanoseconds since the epoch, before which unused files are dormant.
+        jobs (int, optional): The number of threads used to stat files. Defaults to 1.
+
+    Yields:
+        Dict[str, Union[str, int, bool]]: The analysis result for each file that could be stat'ed.
+    """
+    paths = iter(paths)
+    if jobs <= 1:
+        while True:
+            batch = list(itertools.islice(paths, STAT_BATCH_SIZE))
+            if not batch:
+                return
+            yield from analyze_batch(batch, cutoff_ns)
+
+    analyze = functools.partial(analyze_batch, cutoff_ns=cutoff_ns)
+    slice_size = -(-STAT_BATCH_SIZE // jobs)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while True:
+            batch = list(itertools.islice(paths, STAT_BATCH_SIZE))
+            if not batch:
+                return
+            slices = [batch[i:i + slice_size] for i in range(0, len(batch), slice_size)]
+            for results in executor.map(analyze, slices):
+                yield from results
+
+
+def analyze_permissions(path: str, days: int, exclude_patterns: ExcludeSpec = None, jobs: int = 1, processes: int = 1) -> Iterator[Dict[str, Union[str, int, bool]]]:
     """
     Analyzes the permissions of files and directories within the given path.
 
+    Results are produced as the tree is walked, so memory use does not grow
+    with the number of files. With processes > 1 it is bounded by the results
+    of processes + 1 top-level directories instead.
+
     Args:
         path (str): The path to analyze.
         days (int): The number of days to consider when determining dormant permissions.
-        exclude_patterns (pathspec.PathSpec, optional): A PathSpec object containing exclusion patterns. Defaults to None.
+        exclude_patterns (ExcludeSpec, optional): An ExcludeSpec object containing exclusion patterns. Defaults to None.
+        jobs (int, optional): The number of threads used to stat files. Defaults to 1.
+        processes (int, optional): The number of processes sharing the top-level directories of trees
+                                   with at least SHARD_MIN_ENTRIES entries. Only used with exclusion
+                                   patterns, as without them there is little CPU-bound work to
+                                   spread. Defaults to 1.
 
-    Returns:
-        List[Dict[str, Union[str, int, bool]]]: A list of dictionaries, each representing a file or directory
-                                                and its permission analysis results.
+    Yields:
+        Dict[str, Union[str, int, bool]]: A dictionary for each file, representing its permission analysis results.
     """
 
-    results = []
-    cutoff_timestamp = time.time() - (days * 24 * 60 * 60)  # Calculate cutoff timestamp
+    cutoff_ns = time.time_ns() - days * 24 * 60 * 60 * 1_000_000_000  # Calculate cutoff timestamp
 
     if os.path.isfile(path):
         if not is_excluded(path, exclude_patterns):
-            results.append(analyze_file(path, cutoff_timestamp))
-        return results
+            yield from analyze_paths([path], cutoff_ns)
     elif os.path.isdir(path):
-        for root, _, files in os.walk(path):
-            for file in files:
-                full_path = os.path.join(root, file)
-                if not is_excluded(full_path, exclude_patterns):
-                    try:
-                        results.append(analyze_file(full_path, cutoff_timestamp))
-                    except OSError as e:
-                        logging.error(f"Error analyzing {full_path}: {e}")
+        if (processes > 1 and exclude_patterns is not None
+                and not is_excluded(os.path.join(path, ""), exclude_patterns)
+                and has_entries(path, SHARD_MIN_ENTRIES)):
+            yield from analyze_sharded(path, cutoff_ns, exclude_patterns, jobs, processes)
+        else:
+            yield from analyze_paths(iter_files(path, exclude_patterns), cutoff_ns, jobs)
     else:
         logging.error(f"Path '{path}' is not a valid file or directory.")
 
+
+def analyze_batch(paths: Iterable[str], cutoff_ns: int) -> List[Dict[str, Union[str, int, bool]]]:
+    """
+    Analyzes the permissions of a batch of files.
+
+    The statx buffer and the lookups used per file are set up once for the
+    whole batch. ctypes releases the GIL around each statx call, so batches
+    run on different threads overlap their stat calls.
+
+    Args:
+        paths (Iterable[str]): The paths to the files.
+        cutoff_ns (int): The time, in nanoseconds since the epoch, before which unused files are dormant.
+
+    Returns:
+        List[Dict[str, Union[str, int, bool]]]: The analysis results of the files that could be stat'ed.
+    """
+    results = []
+    append = results.append
+    buf = statx_t()
+    filemode = fast_filemode
+
+    for file_path in paths:
+        try:
+            atime_ns, mtime_ns, mode = stat_times(file_path, buf)
+        except OSError as e:
+            logging.error(f"Error getting file stats for {file_path}: {e}")
+            continue
+
+        # Test the access time first: with relatime, atime is bumped whenever it
+        # falls behind mtime, so it is the more recent of the two for almost every
+        # file and settles files that are not dormant with a single comparison.
+        append({
+            "file_path": file_path,
+            "permissions": filemode(mode),
+            "last_access_time_ns": atime_ns,
+            "last_modified_time_ns": mtime_ns,
+            "is_dormant": (atime_ns < cutoff_ns) and (mtime_ns < cutoff_ns)
+        })
     return results
 
 
-def analyze_file(file_path: str, cutoff_timestamp: float) -> Dict[str, Union[str, int, bool]]:
+def analyze_file(file_path: str, cutoff_ns: int) -> Optional[Dict[str, Union[str, int, bool]]]:
     """
     Analyzes the permissions of a single file.
 
     Args:
         file_path (str): The path to the file.
-        cutoff_timestamp (float): The timestamp to use for determining dormant permissions.
+        cutoff_ns (int): The time, in nanoseconds since the epoch, before which unused files are dormant.
 
     Returns:
-        Dict[str, Union[str, int, bool]]: A dictionary containing the file's permission analysis results.
+        Optional[Dict[str, Union[str, int, bool]]]: A dictionary containing the file's permission analysis results,
+                                                    or None if the file could not be stat'ed.
     """
+    results = analyze_batch([file_path], cutoff_ns)
+    return results[0] if results else None
 
-    try:
-        stat_info = os.stat(file_path)
-        last_access_time = stat_info.st_atime
-        last_modified_time = stat_info.st_mtime
-        permissions = stat.filemode(stat_info.st_mode)
-
-        is_dormant = (last_access_time < cutoff_timestamp) and (last_modified_time < cutoff_timestamp)
-
-        return {
-            "file_path": file_path,
-            "permissions": permissions,
-            "last_access_time": last_access_time,
-            "last_modified_time": last_modified_time,
-            "is_dormant": is_dormant
-        }
-    except OSError as e:
-        logging.error(f"Error getting file stats for {file_path}: {e}")
-        return {}
-
-def load_exclude_patterns(exclude_file: str) -> pathspec.PathSpec:
+def load_exclude_patterns(exclude_file: str) -> ExcludeSpec:
     """
     Loads exclusion patterns from a .gitignore-style file.
 
@@ -142,12 +975,12 @@ def load_exclude_patterns(exclude_file: str) -> pathspec.PathSpec:
         exclude_file (str): Path to the exclude file.
 
     Returns:
-        pathspec.PathSpec: A PathSpec object containing the exclusion patterns, or None if the file cannot be loaded.
+        ExcludeSpec: An ExcludeSpec object containing the exclusion patterns, or None if the file cannot be loaded.
     """
     try:
         with open(exclude_file, "r") as f:
             lines = f.readlines()
-            return pathspec.PathSpec(lines)
+            return ExcludeSpec(lines)
     except FileNotFoundError:
         logging.warning(f"Exclude file not found: {exclude_file}")
         return None
@@ -155,56 +988,181 @@ def load_exclude_patterns(exclude_file: str) -> pathspec.PathSpec:
         logging.error(f"Error loading exclude file {exclude_file}: {e}")
         return None
 
-def generate_report(results: List[Dict[str, Union[str, int, bool]]], output_file: str) -> None:
+# time.ctime() output for the most recently used whole seconds
+_ctime_second = functools.lru_cache(maxsize=CTIME_CACHE_SIZE)(time.ctime)
+
+
+def cached_ctime(timestamp_ns: int) -> str:
+    """
+    Formats a nanosecond timestamp like time.ctime, reusing the text of
+    recently formatted seconds.
+
+    Files unpacked or built together tend to share timestamps, so the report
+    and the table mostly hit the cache, which is bounded by CTIME_CACHE_SIZE.
+
+    Args:
+        timestamp_ns (int): Nanoseconds since the epoch.
+
+    Returns:
+        str: The formatted time.
+    """
+    return _ctime_second(timestamp_ns // 1_000_000_000)
+
+
+def write_chunk(f, text: str) -> bool:
+    """
+    Writes a chunk of the report, logging rather than raising I/O errors.
+
+    Args:
+        f: The text file the report is written to.
+        text (str): The chunk to write.
+
+    Returns:
+        bool: True if the chunk was written.
+    """
+    try:
+        f.write(text)
+        return True
+    except OSError as e:
+        logging.error(f"Error writing report to file: {e}")
+        return False
+
+
+def emit(results: Iterable[Dict[str, Union[str, int, bool]]], f, rows: Deque[Tuple[str, str, str, str, str]]) -> Tuple[int, int, bool]:
+    """
+    Writes the report and collects the table rows in a single pass over the results.
+
+    Each result's fields are formatted once and shared by its report entry and
+    its table row. Report entries are joined and written in chunks of
+    REPORT_CHUNK_SIZE. If a write fails, the rest of the results are still
+    consumed into the rows and counts.
+
+    Args:
+        results (Iterable[Dict[str, Union[str, int, bool]]]): The analysis results.
+        f: The text file the report is written to, or None to only collect the rows and counts.
+        rows (Deque[Tuple[str, str, str, str, str]]): A deque receiving the table row of each result.
+
+    Returns:
+        Tuple[int, int, bool]: The number of files reported, how many of them are dormant,
+                               and whether the whole report was written.
+    """
+    total = dormant = 0
+    parts = ["Permission Analysis Report\n---------------------------\n"]
+    append = parts.append
+    add_row = rows.append
+    ctime = cached_ctime
+    for result in results:
+        row = (
+            result['file_path'],
+            result['permissions'],
+            ctime(result['last_access_time_ns']),
+            ctime(result['last_modified_time_ns']),
+            str(result['is_dormant'])
+        )
+        append(
+            f"File: {row[0]}\n"
+            f"  Permissions: {row[1]}\n"
+            f"  Last Access Time: {row[2]}\n"
+            f"  Last Modified Time: {row[3]}\n"
+            f"  Is Dormant: {row[4]}\n"
+            "\n"
+        )
+        add_row(row)
+        total += 1
+        dormant += result['is_dormant']
+        if len(parts) >= REPORT_CHUNK_SIZE:
+            if f is not None and not write_chunk(f, "".join(parts)):
+                f = None
+            parts.clear()
+    written = f is not None and write_chunk(f, "".join(parts))
+    return total, dormant, written
+
+
+def generate_report(results: Iterable[Dict[str, Union[str, int, bool]]], output_file: str, rows: Deque[Tuple[str, str, str, str, str]] = None) -> Tuple[int, int]:
     """
     Generates a report of the permission analysis results and writes it to a file.
 
+    The results are consumed lazily, so the report is written while the
+    analysis is still running. They are consumed in full even if the report
+    cannot be written, so the table rows and counts are always complete.
+
     Args:
-        results (List[Dict[str, Union[str, int, bool]]]): A list of dictionaries containing the analysis results.
+        results (Iterable[Dict[str, Union[str, int, bool]]]): The analysis results.
         output_file (str): The path to the output file.
+        rows (Deque[Tuple[str, str, str, str, str]], optional): A deque receiving the table row of each result,
+                                                                see generate_rich_table. Defaults to None.
+
+    Returns:
+        Tuple[int, int]: The number of files reported and how many of them are dormant.
     """
+    if rows is None:
+        rows = collections.deque(maxlen=0)
 
     try:
-        with open(output_file, "w") as f:
-            f.write("Permission Analysis Report\n")
-            f.write("---------------------------\n")
-            for result in results:
-                f.write(f"File: {result['file_path']}\n")
-                f.write(f"  Permissions: {result['permissions']}\n")
-                f.write(f"  Last Access Time: {time.ctime(result['last_access_time'])}\n")
-                f.write(f"  Last Modified Time: {time.ctime(result['last_modified_time'])}\n")
-                f.write(f"  Is Dormant: {result['is_dormant']}\n")
-                f.write("\n")
-        logging.info(f"Report saved to {output_file}")
-
-    except Exception as e:
+        f = open(output_file, "w", buffering=REPORT_BUFFER_SIZE)
+    except OSError as e:
         logging.error(f"Error writing report to file: {e}")
+        f = None
+
+    try:
+        total, dormant, written = emit(results, f, rows)
+    finally:
+        if f is not None:
+            try:
+                f.close()
+            except OSError as e:
+                logging.error(f"Error writing report to file: {e}")
+                written = False
+    if written:
+        logging.info(f"Report saved to {output_file}")
+    return total, dormant
 
-def generate_rich_table(results: List[Dict[str, Union[str, int, bool]]]) -> Table:
+def generate_rich_table(rows: Collection[Tuple[str, str, str, str, str]], total: int = None) -> Table:
     """
     Generates a Rich table for displaying the analysis results.
 
     Args:
-        results (List[Dict[str, Union[str, int, bool]]]): A list of dictionaries containing the analysis results.
+        rows (Collection[Tuple[str, str, str, str, str]]): The formatted rows collected by generate_report.
+        total (int, optional): The number of files in the report, if more than the rows shown. Defaults to None.
 
     Returns:
         Table: A Rich Table object.
     """
-    table = Table(title="Permission Analysis Results")
+    from rich.table import Table
+
+    caption = None
+    if total is not None and total > len(rows):
+        caption = f"Showing the last {len(rows)} of {total} files, see the report for the rest"
+    table = Table(title="Permission Analysis Results", caption=caption)
     table.add_column("File Path", style="cyan")
     table.add_column("Permissions", style="magenta")
     table.add_column("Last Access Time", style="green")
     table.add_column("Last Modified Time", style="green")
     table.add_column("Is Dormant", style="red")
 
-    for result in results:
-        table.add_row(
-            result['file_path'],
-            result['permissions'],
-            time.ctime(result['last_access_time']),
-            time.ctime(result['last_modified_time']),
-            str(result['is_dormant'])
-        )
+    for row in rows:
+        table.add_row(*row)
+    return table
+
+
+def generate_summary_table(total: int, dormant: int) -> Table:
+    """
+    Generates a Rich table summarizing the analysis results in a single row.
+
+    Args:
+        total (int): The number of files analyzed.
+        dormant (int): The number of dormant files.
+
+    Returns:
+        Table: A Rich Table object.
+    """
+    from rich.table import Table
+
+    table = Table(title="Permission Analysis Summary")
+    table.add_column("Files", style="cyan")
+    table.add_column("Dormant", style="red")
+    table.add_column("Active", style="green")
+    table.add_row(str(total), str(dormant), str(total - dormant))
     return table
 
 
@@ -212,8 +1170,7 @@ def main():
     """
     Main function to execute the permission analysis tool.
     """
-    parser = setup_argparse()
-    args = parser.parse_args()
+    args = parse_args()
 
     # Input validation
     if not os.path.exists(args.path):
@@ -224,17 +1181,30 @@ def main():
         logging.error("Error: The number of days must be a positive integer.")
         return
 
+    if args.jobs <= 0:
+        logging.error("Error: The number of jobs must be a positive integer.")
+        return
+
+    if args.processes <= 0:
+        logging.error("Error: The number of processes must be a positive integer.")
+        return
+
     exclude_patterns = None
     if args.exclude:
         exclude_patterns = load_exclude_patterns(args.exclude)
 
     try:
-        results = analyze_permissions(args.path, args.days, exclude_patterns)
-        generate_report(results, args.output)
+        results = analyze_permissions(args.path, args.days, exclude_patterns, args.jobs, args.processes)
+        table_rows = collections.deque(maxlen=0 if args.summary else TABLE_ROW_LIMIT)
+        total, dormant = generate_report(results, args.output, table_rows)
+
+        from rich.console import Console
 
         console = Console()
-        table = generate_rich_table(results)
-        console.print(table)
+        if args.summary:
+            console.print(generate_summary_table(total, dormant))
+        else:
+            console.print(generate_rich_table(table_rows, total))
 
 
     except Exception as e: